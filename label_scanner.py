@@ -0,0 +1,101 @@
+import numpy as np
+from numba import njit
+
+# JIT-compiled scanner for literal, line-anchored account labels. Imported
+# lazily by populater, only for texts large enough to pay back the JIT
+# start-up cost.
+
+# Values with more digits than this may not fit in int64; they are flagged
+# instead of parsed so the caller can fall back to clean_number
+MAX_DIGITS = 18
+
+@njit(cache=True)
+def is_space(c):
+    # Same set as \s in a bytes pattern: space, \t, \n, \v, \f, \r
+    return c == 32 or (9 <= c <= 13)
+
+@njit(cache=True)
+def is_blank(c):
+    # Space or tab, as in [ \t]
+    return c == 32 or c == 9
+
+@njit(cache=True)
+def is_digit(c):
+    return 48 <= c <= 57
+
+@njit(cache=True)
+def scan_labels(buf, labels, offsets, out, found, too_long):
+    """For each label, parse the number after its first line-start occurrence that is followed by one"""
+    n = buf.size
+    for k in range(offsets.size - 1):
+        for i in range(n):
+            # Labels only start at the beginning of a line, after optional indentation
+            if i > 0 and buf[i - 1] != 10:
+                continue
+            j = i
+            while j < n and is_blank(buf[j]):
+                j += 1
+
+            # Match the label case-insensitively; a space matches one or more spaces/tabs
+            p = offsets[k]
+            matched = True
+            while p < offsets[k + 1]:
+                if labels[p] == 32:
+                    if j >= n or not is_blank(buf[j]):
+                        matched = False
+                        break
+                    while j < n and is_blank(buf[j]):
+                        j += 1
+                else:
+                    c = buf[j] if j < n else 0
+                    if 65 <= c <= 90:
+                        c += 32
+                    if c != labels[p]:
+                        matched = False
+                        break
+                    j += 1
+                p += 1
+            if not matched:
+                continue
+
+            # Whitespace, including the UTF-8 no-break space C2 A0, then the
+            # number: digits with optional ",ddd" groups
+            gap = j
+            while j < n:
+                if is_space(buf[j]):
+                    j += 1
+                elif buf[j] == 0xC2 and j + 1 < n and buf[j + 1] == 0xA0:
+                    j += 2
+                else:
+                    break
+            if j == gap or j >= n or not is_digit(buf[j]):
+                continue
+            value = 0
+            digits = 0
+            while j < n:
+                if is_digit(buf[j]):
+                    if digits < MAX_DIGITS:
+                        value = value * 10 + (buf[j] - 48)
+                    digits += 1
+                    j += 1
+                elif buf[j] == 44 and j + 1 < n and is_digit(buf[j + 1]):
+                    j += 1
+                else:
+                    break
+            out[k] = value
+            found[k] = True
+            too_long[k] = digits > MAX_DIGITS
+            break
+
+def scan_accounts(data, labels, offsets):
+    """Run scan_labels over a bytes-like buffer
+
+    Returns (values, found, too_long) arrays with one entry per label; values
+    flagged in too_long were not parsed and must be read some other way.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    out = np.zeros(offsets.size - 1, dtype=np.int64)
+    found = np.zeros(offsets.size - 1, dtype=np.bool_)
+    too_long = np.zeros(offsets.size - 1, dtype=np.bool_)
+    scan_labels(buf, labels, offsets, out, found, too_long)
+    return out, found, too_long
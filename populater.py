@@ -1,7 +1,26 @@
+import copy
+import functools
 import json
+import mmap
+import os
 import re
 from pathlib import Path
 
+# Optional C JSON parser/emitter; falls back to the standard json module when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional multi-pattern scanner; falls back to per-pattern re searches when missing
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Translation table that deletes commas and whitespace in one str.translate call
+_STRIP_TBL = str.maketrans('', '', ', \t\n\r\f\v')
+
 def clean_number(value_str):
     """
     Clean and convert a string value to float
@@ -13,7 +32,7 @@ def clean_number(value_str):
     
     # Remove commas and whitespace from the number string
     # Example: "1,250,000" becomes "1250000"
-    cleaned = re.sub(r'[,\s]', '', value_str)
+    cleaned = value_str.translate(_STRIP_TBL)
     
     # Handle negative values in parentheses - ACCOUNTING FORMAT
     # In accounting, negative numbers are often shown as (1,250,000) instead of -1,250,000
@@ -29,196 +48,340 @@ def clean_number(value_str):
         # If conversion fails, return 0 as default
         return 0
 
-def extract_value_from_text(text, pattern):
-    """
-    Extract a numeric value using regex pattern
-    Uses multiple regex flags for flexible matching across lines and case-insensitive
-    """
-    match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-    if match:
-        # Extract the captured group (the number) and clean it
-        return clean_number(match.group(1))
-    return 0
+def _set_nested(populated, path, value):
+    """Assign value at the nested key path inside the populated template"""
+    node = populated
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = value
 
-def populate_balance_sheet(text_content, template):
-    """
-    Populate the balance sheet template with values extracted from PDF text
-    This function uses regex patterns to find account numbers and their corresponding values
-    """
-    populated = template.copy()
-    
-    # === COMPANY INFORMATION EXTRACTION ===
-    # Extract company info - look for pattern like "XYZ, Inc."
-    company_match = re.search(r'([A-Z]+),?\s*Inc\.?', text_content)
-    if company_match:
-        populated["company_name"] = company_match.group(1).strip()
-    
-    # Extract report date - look for "As of December 31, 2018" pattern
-    date_match = re.search(r'As of\s+([^\n]+)', text_content, re.IGNORECASE)
-    if date_match:
-        populated["report_date"] = date_match.group(1).strip()
-    
-    # === ASSETS SECTION ===
+# Flags shared by every balance-sheet account pattern
+# No DOTALL: none of the patterns use "." and every label sits on its own line
+_FLAGS = re.IGNORECASE
+
+def _at_line_start(data, pos):
+    """True if only spaces or tabs lie between the start of pos's line and pos"""
+    while pos > 0 and data[pos - 1] in b' \t':
+        pos -= 1
+    return pos == 0 or data[pos - 1] == 10
+
+def _search_line_start(pattern, data):
+    """First match of pattern whose label begins a line, after optional indentation"""
+    # The patterns start with their literal label rather than ^[ \t]*, so re
+    # can jump straight to candidate labels; the line-start rule is checked on
+    # each candidate instead of inside the regex
+    match = pattern.search(data)
+    while match and not _at_line_start(data, match.start()):
+        match = pattern.search(data, match.start() + 1)
+    return match
+
+# === PRECOMPILED ACCOUNT PATTERNS ===
+# Compiled once at import time instead of on every populate_balance_sheet call
+# Patterns are bytes so they can scan a memory-mapped text file in place
+# Pattern explanation: rb'1010[ \t]+Checking(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)'
+# - 1010: Account number; only accepted at the start of a line, see _search_line_start
+# - [ \t]+: Spaces or tabs - the label itself never spans lines
+# - Checking: Account name
+# - (?:\s|\xc2\xa0)+: Any whitespace, including the newline before a value on the
+#   next line; bytes \s is ASCII-only, so the UTF-8 no-break space (U+00A0) that
+#   PDFs often put between a label and its amount is listed explicitly
+# - (\d+(?:,\d+)*): Capture group for number with optional commas
+PATTERNS = {
     # Current Assets - Cash Components
-    # Pattern explanation: r'1010\s+Checking\s+(\d+(?:,\d+)*)'
-    # - 1010: Account number
-    # - \s+: One or more whitespace characters
-    # - Checking: Account name
-    # - \s+: More whitespace
-    # - (\d+(?:,\d+)*): Capture group for number with optional commas
-    
-    populated["assets"]["current_assets"]["cash"]["1010_checking"] = extract_value_from_text(
-        text_content, r'1010\s+Checking\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["current_assets"]["cash"]["1020_savings"] = extract_value_from_text(
-        text_content, r'1020\s+Savings\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["current_assets"]["cash"]["1030_petty_cash"] = extract_value_from_text(
-        text_content, r'1030\s+Petty\s+Cash\s+(\d+(?:,\d+)*)'
-    )
-    # Total cash is the sum of all cash accounts
-    populated["assets"]["current_assets"]["cash"]["total_cash"] = extract_value_from_text(
-        text_content, r'Total\s+Cash\s+(\d+(?:,\d+)*)'
-    )
-    
+    "1010_checking": re.compile(rb'1010[ \t]+Checking(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1020_savings": re.compile(rb'1020[ \t]+Savings(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1030_petty_cash": re.compile(rb'1030[ \t]+Petty[ \t]+Cash(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_cash": re.compile(rb'Total[ \t]+Cash(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
     # Other Current Assets
-    populated["assets"]["current_assets"]["1100_accounts_receivable"] = extract_value_from_text(
-        text_content, r'1100\s+Accounts\s+Receivable\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["current_assets"]["1200_work_in_process"] = extract_value_from_text(
-        text_content, r'1200\s+Work\s+in\s+Process\s+(\d+(?:,\d+)*)'
-    )
-    
-    # Other Current Assets - Subcategory
-    populated["assets"]["current_assets"]["other_current_assets"]["1310_prepaid_rent"] = extract_value_from_text(
-        text_content, r'1310\s+Prepaid\s+Rent\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["current_assets"]["other_current_assets"]["1320_prepaid_liability_insurance"] = extract_value_from_text(
-        text_content, r'1320\s+Prepaid\s+Liability\s+Insurance\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["current_assets"]["other_current_assets"]["total_other_current_assets"] = extract_value_from_text(
-        text_content, r'Total\s+Other\s+Current\s+Assets\s+(\d+(?:,\d+)*)'
-    )
-    
-    # Total Current Assets - Sum of all current asset categories
-    populated["assets"]["current_assets"]["total_current_assets"] = extract_value_from_text(
-        text_content, r'Total\s+Current\s+Assets\s+(\d+(?:,\d+)*)'
-    )
-    
-    # === NON-CURRENT ASSETS (Fixed Assets) ===
-    # These are long-term assets like equipment, real estate, etc.
-    populated["assets"]["non_current_assets"]["1400_net_computer_equipment"] = extract_value_from_text(
-        text_content, r'1400\s+Net\s+Computer\s+Equipment\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["1500_net_furniture_fixtures_equipment"] = extract_value_from_text(
-        text_content, r'1500\s+Net\s+Furniture,\s+Fixtures,\s+&\s+Equipment\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["1600_net_field_equipment"] = extract_value_from_text(
-        text_content, r'1600\s+Net\s+Field\s+Equipment\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["1700_net_real_estate"] = extract_value_from_text(
-        text_content, r'1700\s+Net\s+Real\s+Estate\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["1800_net_leasehold_improvements"] = extract_value_from_text(
-        text_content, r'1800\s+Net\s+Leasehold\s+Improvements\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["1900_other_assets"] = extract_value_from_text(
-        text_content, r'1900\s+Other\s+Assets\s+(\d+(?:,\d+)*)'
-    )
-    populated["assets"]["non_current_assets"]["total_non_current_assets"] = extract_value_from_text(
-        text_content, r'Total\s+Non-Current\s+Assets\s+(\d+(?:,\d+)*)'
-    )
-    
-    # TOTAL ASSETS - Sum of current and non-current assets
-    populated["assets"]["total_assets"] = extract_value_from_text(
-        text_content, r'Total\s+Assets\s+(\d+(?:,\d+)*)'
-    )
-    
-    # === LIABILITIES SECTION ===
+    "1100_accounts_receivable": re.compile(rb'1100[ \t]+Accounts[ \t]+Receivable(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1200_work_in_process": re.compile(rb'1200[ \t]+Work[ \t]+in[ \t]+Process(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1310_prepaid_rent": re.compile(rb'1310[ \t]+Prepaid[ \t]+Rent(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1320_prepaid_liability_insurance": re.compile(rb'1320[ \t]+Prepaid[ \t]+Liability[ \t]+Insurance(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_other_current_assets": re.compile(rb'Total[ \t]+Other[ \t]+Current[ \t]+Assets(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_current_assets": re.compile(rb'Total[ \t]+Current[ \t]+Assets(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    # Non-Current Assets (Fixed Assets)
+    "1400_net_computer_equipment": re.compile(rb'1400[ \t]+Net[ \t]+Computer[ \t]+Equipment(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1500_net_furniture_fixtures_equipment": re.compile(rb'1500[ \t]+Net[ \t]+Furniture,[ \t]+Fixtures,[ \t]+&[ \t]+Equipment(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1600_net_field_equipment": re.compile(rb'1600[ \t]+Net[ \t]+Field[ \t]+Equipment(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1700_net_real_estate": re.compile(rb'1700[ \t]+Net[ \t]+Real[ \t]+Estate(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1800_net_leasehold_improvements": re.compile(rb'1800[ \t]+Net[ \t]+Leasehold[ \t]+Improvements(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "1900_other_assets": re.compile(rb'1900[ \t]+Other[ \t]+Assets(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_non_current_assets": re.compile(rb'Total[ \t]+Non-Current[ \t]+Assets(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_assets": re.compile(rb'Total[ \t]+Assets(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
     # Current Liabilities (due within one year)
-    populated["liabilities"]["current_liabilities"]["2000_accounts_payable"] = extract_value_from_text(
-        text_content, r'2000\s+Accounts\s+Payable\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["current_liabilities"]["2100_deferred_taxes"] = extract_value_from_text(
-        text_content, r'2100\s+Deferred\s+Taxes\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["current_liabilities"]["2200_line_of_credit_borrowing"] = extract_value_from_text(
-        text_content, r'2200\s+Line\s+of\s+Credit\s+Borrowing\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["current_liabilities"]["2300_current_portion_long_term_debt"] = extract_value_from_text(
-        text_content, r'2300\s+Current\s+Portion\s+of\s+Long-Term\s+Debt\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["current_liabilities"]["2400_other_current_liabilities"] = extract_value_from_text(
-        text_content, r'2400\s+Other\s+Current\s+Liabilities\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["current_liabilities"]["total_current_liabilities"] = extract_value_from_text(
-        text_content, r'Total\s+Current\s+Liabilities\s+(\d+(?:,\d+)*)'
-    )
-    
+    "2000_accounts_payable": re.compile(rb'2000[ \t]+Accounts[ \t]+Payable(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "2100_deferred_taxes": re.compile(rb'2100[ \t]+Deferred[ \t]+Taxes(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "2200_line_of_credit_borrowing": re.compile(rb'2200[ \t]+Line[ \t]+of[ \t]+Credit[ \t]+Borrowing(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "2300_current_portion_long_term_debt": re.compile(rb'2300[ \t]+Current[ \t]+Portion[ \t]+of[ \t]+Long-Term[ \t]+Debt(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "2400_other_current_liabilities": re.compile(rb'2400[ \t]+Other[ \t]+Current[ \t]+Liabilities(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_current_liabilities": re.compile(rb'Total[ \t]+Current[ \t]+Liabilities(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
     # Non-Current Liabilities (long-term debt, due after one year)
-    populated["liabilities"]["non_current_liabilities"]["2500_long_term_debt"] = extract_value_from_text(
-        text_content, r'2500\s+Long-Term\s+Debt\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["non_current_liabilities"]["2600_other_liabilities"] = extract_value_from_text(
-        text_content, r'2600\s+Other\s+Liabilities\s+(\d+(?:,\d+)*)'
-    )
-    populated["liabilities"]["non_current_liabilities"]["total_non_current_liabilities"] = extract_value_from_text(
-        text_content, r'Total\s+Non-Current\s+Liabilities\s+(\d+(?:,\d+)*)'
-    )
+    "2500_long_term_debt": re.compile(rb'2500[ \t]+Long-Term[ \t]+Debt(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "2600_other_liabilities": re.compile(rb'2600[ \t]+Other[ \t]+Liabilities(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_non_current_liabilities": re.compile(rb'Total[ \t]+Non-Current[ \t]+Liabilities(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_liabilities": re.compile(rb'Total[ \t]+Liabilities(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    # Equity - owner's equity in the company
+    "3000_capital_stock": re.compile(rb'3000[ \t]+Capital[ \t]+Stock(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "3200_retained_earnings": re.compile(rb'3200[ \t]+Retained[ \t]+Earnings(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    "total_equity": re.compile(rb'Total[ \t]+Equity(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+    # Balance sheet equation check: Total Liabilities + Equity should equal Total Assets
+    "total_liabilities_and_equity": re.compile(rb'Total[ \t]+Liabilities[ \t]+and[ \t]+Equity(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)', _FLAGS),
+}
+
+# === HYPERSCAN DATABASE (optional) ===
+# Hyperscan matches every account pattern in one pass over the text, but it
+# does not report capture groups. It only tells us where each account starts;
+# the small per-account pattern is then anchored at that offset to pull out
+# the number. The ^[ \t]* line anchor costs Hyperscan nothing, so it stays in
+# the compiled expressions instead of being checked per match.
+ACCOUNT_NAMES = list(PATTERNS)
+
+if hyperscan is not None:
+    HS_DATABASE = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    HS_DATABASE.compile(
+        expressions=[rb'^[ \t]*' + PATTERNS[name].pattern for name in ACCOUNT_NAMES],
+        ids=list(range(len(ACCOUNT_NAMES))),
+        elements=len(ACCOUNT_NAMES),
+        flags=[
+            hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE
+            | hyperscan.HS_FLAG_SOM_LEFTMOST
+        ] * len(ACCOUNT_NAMES),
+    )
+else:
+    HS_DATABASE = None
+
+# === NUMBA LITERAL SCANNER (optional) ===
+# Every account pattern is a literal label, accepted at the start of a line,
+# with words separated by [ \t]+, followed by whitespace and a comma-grouped
+# number. That needs no regex engine: the labels are flattened into one
+# lowercase byte array (a single space standing for a run of spaces/tabs) and
+# scanned by a compiled loop over the raw bytes.
+_VALUE_SUFFIX = rb'(?:\s|\xc2\xa0)+(\d+(?:,\d+)*)'
+
+def _literal_label(pattern):
+    """Turn an account pattern into its lowercase label with single spaces between words"""
+    source = pattern.pattern
+    if not source.endswith(_VALUE_SUFFIX):
+        raise ValueError(f"Account pattern is not a label followed by a value: {source!r}")
+    label = source[:-len(_VALUE_SUFFIX)].replace(rb'[ \t]+', b' ').lower()
+    if re.search(rb'[\\()\[\]*+?.|^$]', label):
+        raise ValueError(f"Account label is not a plain literal: {label!r}")
+    return label
+
+# Texts at least this large use the Numba scanner when Hyperscan is missing.
+# Importing numba and loading the compiled kernel costs ~0.3 s per process,
+# which only pays for itself against the re searches on very large texts.
+NUMBA_MIN_BYTES = 1 << 20
+
+@functools.lru_cache(maxsize=1)
+def _label_scanner():
+    """Import the Numba label scanner and build its label arrays on first use; None without numba"""
+    try:
+        import numpy as np
+        import label_scanner
+    except ImportError:
+        return None
+    labels = [_literal_label(PATTERNS[name]) for name in ACCOUNT_NAMES]
+    label_bytes = np.frombuffer(b''.join(labels), dtype=np.uint8)
+    offsets = np.cumsum([0] + [len(label) for label in labels]).astype(np.int64)
+    return label_scanner, label_bytes, offsets
+
+def _scan_accounts_numba(data, values):
+    """Fill values with the first match of every account using the compiled literal scanner"""
+    label_scanner, label_bytes, offsets = _label_scanner()
+    out, found, too_long = label_scanner.scan_accounts(data, label_bytes, offsets)
+    for k, name in enumerate(ACCOUNT_NAMES):
+        if too_long[k]:
+            # Too many digits for the int64 accumulator; re-read this one with its pattern
+            match = _search_line_start(PATTERNS[name], data)
+            values[FIELD_INDEX[name]] = clean_number(match.group(1).decode('utf-8'))
+        elif found[k]:
+            values[FIELD_INDEX[name]] = float(out[k])
+
+# Company and date headers, plus the parenthesised treasury stock line
+COMPANY_PATTERN = re.compile(rb'([A-Z]+),?\s*Inc\.?')
+DATE_PATTERN = re.compile(rb'As of\s+([^\n]+)', re.IGNORECASE)
+TREASURY_PATTERN = re.compile(rb'3100[ \t]+Treasury[ \t]+Stock(?:\s|\xc2\xa0)+\((\d+(?:,\d+)*)\)', _FLAGS)
+
+# Where each extracted account lands in the template, in PATTERNS order
+FIELDS = [
+    ("assets", "current_assets", "cash", "1010_checking"),
+    ("assets", "current_assets", "cash", "1020_savings"),
+    ("assets", "current_assets", "cash", "1030_petty_cash"),
+    ("assets", "current_assets", "cash", "total_cash"),
+    ("assets", "current_assets", "1100_accounts_receivable"),
+    ("assets", "current_assets", "1200_work_in_process"),
+    ("assets", "current_assets", "other_current_assets", "1310_prepaid_rent"),
+    ("assets", "current_assets", "other_current_assets", "1320_prepaid_liability_insurance"),
+    ("assets", "current_assets", "other_current_assets", "total_other_current_assets"),
+    ("assets", "current_assets", "total_current_assets"),
+    ("assets", "non_current_assets", "1400_net_computer_equipment"),
+    ("assets", "non_current_assets", "1500_net_furniture_fixtures_equipment"),
+    ("assets", "non_current_assets", "1600_net_field_equipment"),
+    ("assets", "non_current_assets", "1700_net_real_estate"),
+    ("assets", "non_current_assets", "1800_net_leasehold_improvements"),
+    ("assets", "non_current_assets", "1900_other_assets"),
+    ("assets", "non_current_assets", "total_non_current_assets"),
+    ("assets", "total_assets"),
+    ("liabilities", "current_liabilities", "2000_accounts_payable"),
+    ("liabilities", "current_liabilities", "2100_deferred_taxes"),
+    ("liabilities", "current_liabilities", "2200_line_of_credit_borrowing"),
+    ("liabilities", "current_liabilities", "2300_current_portion_long_term_debt"),
+    ("liabilities", "current_liabilities", "2400_other_current_liabilities"),
+    ("liabilities", "current_liabilities", "total_current_liabilities"),
+    ("liabilities", "non_current_liabilities", "2500_long_term_debt"),
+    ("liabilities", "non_current_liabilities", "2600_other_liabilities"),
+    ("liabilities", "non_current_liabilities", "total_non_current_liabilities"),
+    ("liabilities", "total_liabilities"),
+    ("equity", "3000_capital_stock"),
+    ("equity", "3200_retained_earnings"),
+    ("equity", "total_equity"),
+    ("total_liabilities_and_equity",),
+]
+
+TREASURY_PATH = ("equity", "3100_treasury_stock")
+
+# === FLAT FIELD LAYOUT ===
+# Extracted values live in a flat list aligned with FIELD_PATHS; the nested
+# template structure is only rebuilt once, by _rehydrate, at the very end
+FIELD_PATHS = FIELDS + [TREASURY_PATH]
+FIELD_NAMES = [path[-1] for path in FIELD_PATHS]
+TREASURY_INDEX = len(FIELD_PATHS) - 1
+
+# Account name -> index into the flat value list
+FIELD_INDEX = {name: i for i, name in enumerate(FIELD_NAMES)}
+
+def _scan_accounts_hyperscan(data, values):
+    """Fill values with the first match of every account using a single Hyperscan pass"""
+    starts = {}
     
-    # TOTAL LIABILITIES - Sum of current and non-current liabilities
-    populated["liabilities"]["total_liabilities"] = extract_value_from_text(
-        text_content, r'Total\s+Liabilities\s+(\d+(?:,\d+)*)'
-    )
+    def on_match(pattern_id, start, end, flags, context):
+        # Matches arrive in order of end offset, so the first one seen for an
+        # account is its first occurrence in the text
+        if pattern_id not in starts:
+            starts[pattern_id] = start
     
-    # === EQUITY SECTION ===
-    # Owner's equity in the company
-    populated["equity"]["3000_capital_stock"] = extract_value_from_text(
-        text_content, r'3000\s+Capital\s+Stock\s+(\d+(?:,\d+)*)'
-    )
+    HS_DATABASE.scan(data, match_event_handler=on_match)
+    
+    for pattern_id, start in starts.items():
+        name = ACCOUNT_NAMES[pattern_id]
+        # start is the beginning of the line; step over the indentation to the label
+        while data[start] in b' \t':
+            start += 1
+        match = PATTERNS[name].match(data, start)
+        if match:
+            values[FIELD_INDEX[name]] = clean_number(match.group(1).decode('utf-8'))
+
+def _scan_accounts_re(data, values):
+    """Fill values with the first match of every account using the precompiled patterns"""
+    # One search per account; a single alternation of all the labels would
+    # stop at every overlapping match and miss accounts that follow it
+    for name, pattern in PATTERNS.items():
+        match = _search_line_start(pattern, data)
+        if match:
+            values[FIELD_INDEX[name]] = clean_number(match.group(1).decode('utf-8'))
+
+def extract_account_values(data):
+    """
+    Extract every account value from UTF-8 text bytes into a flat list aligned with FIELD_PATHS
+    Accepts bytes or any bytes-like buffer such as an mmap; unmatched accounts stay at 0
+    """
+    values = [0] * len(FIELD_PATHS)
+    
+    # Assets, liabilities and equity accounts all come from one scan of the text
+    if HS_DATABASE is not None:
+        _scan_accounts_hyperscan(data, values)
+    elif len(data) >= NUMBA_MIN_BYTES and _label_scanner() is not None:
+        _scan_accounts_numba(data, values)
+    else:
+        _scan_accounts_re(data, values)
     
     # SPECIAL CASE: Treasury Stock - Always negative, shown in parentheses
     # This is the SECOND place where brackets are handled as negative
     # Treasury stock represents company's own shares that were bought back
     # Pattern looks for: "3100 Treasury Stock (1,250,000)"
-    treasury_match = re.search(r'3100\s+Treasury\s+Stock\s+\((\d+(?:,\d+)*)\)', text_content, re.IGNORECASE)
+    treasury_match = _search_line_start(TREASURY_PATTERN, data)
     if treasury_match:
         # Explicitly make it negative since treasury stock reduces equity
         # The clean_number function would also handle this, but we're being explicit here
-        populated["equity"]["3100_treasury_stock"] = -clean_number(treasury_match.group(1))
+        values[TREASURY_INDEX] = -clean_number(treasury_match.group(1).decode('utf-8'))
     
-    # Retained earnings - accumulated profits kept in the business
-    populated["equity"]["3200_retained_earnings"] = extract_value_from_text(
-        text_content, r'3200\s+Retained\s+Earnings\s+(\d+(?:,\d+)*)'
-    )
-    populated["equity"]["total_equity"] = extract_value_from_text(
-        text_content, r'Total\s+Equity\s+(\d+(?:,\d+)*)'
-    )
+    return values
+
+def _rehydrate(template, field_paths, values):
+    """Build the nested balance sheet from the template and the flat value list"""
+    # Deep copy so the nested sections of the caller's (possibly cached) template are never modified
+    populated = copy.deepcopy(template)
+    for path, value in zip(field_paths, values):
+        _set_nested(populated, path, value)
+    return populated
+
+def populate_balance_sheet(text_content, template):
+    """
+    Populate the balance sheet template with values extracted from PDF text
+    This function uses regex patterns to find account numbers and their corresponding values
+    text_content may be a str or UTF-8 bytes (including a memory-mapped file)
+    """
+    # Patterns are bytes, so str input is encoded once up front
+    if isinstance(text_content, str):
+        text_content = text_content.encode('utf-8')
     
-    # === BALANCE SHEET EQUATION CHECK ===
-    # Total Liabilities + Equity should equal Total Assets
-    populated["total_liabilities_and_equity"] = extract_value_from_text(
-        text_content, r'Total\s+Liabilities\s+and\s+Equity\s+(\d+(?:,\d+)*)'
-    )
+    # === ACCOUNT VALUES ===
+    values = extract_account_values(text_content)
+    populated = _rehydrate(template, FIELD_PATHS, values)
+    
+    # === COMPANY INFORMATION EXTRACTION ===
+    # Extract company info - look for pattern like "XYZ, Inc."
+    company_match = COMPANY_PATTERN.search(text_content)
+    if company_match:
+        populated["company_name"] = company_match.group(1).decode('utf-8').strip()
+    
+    # Extract report date - look for "As of December 31, 2018" pattern
+    date_match = DATE_PATTERN.search(text_content)
+    if date_match:
+        populated["report_date"] = date_match.group(1).decode('utf-8').strip()
     
     return populated
 
+def load_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def dump_json(data, path):
+    """Write data to a JSON file with 2-space indentation, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+@functools.lru_cache(maxsize=4)
+def load_template(template_path):
+    """Load and parse a JSON template once per path; callers must not modify the result"""
+    return load_json(template_path)
+
 def populate_from_files(template_path, text_file_path, output_path):
     """Populate template from files and save result"""
-    # Load template
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template = json.load(f)
-    
-    # Load text content
-    with open(text_file_path, 'r', encoding='utf-8') as f:
-        text_content = f.read()
+    # Load template (parsed once and reused across PDFs)
+    template = load_template(str(template_path))
     
-    # Populate the template
-    populated = populate_balance_sheet(text_content, template)
+    # Memory-map the text file so the patterns scan it in place without a full str copy
+    with open(text_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            populated = populate_balance_sheet(b'', template)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as text_content:
+                # Populate the template
+                populated = populate_balance_sheet(text_content, template)
     
     # Save populated JSON
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(populated, f, indent=2)
+    dump_json(populated, output_path)
     
     print(f"Populated balance sheet saved to: {output_path}")
     return populated
@@ -1,20 +1,20 @@
-import json
-import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from pdf_processor import process_pdf
-from populater import populate_from_files
+from pdf_processor import process_pdf, find_pdf_files, partition_by_stem, MAX_WORKERS
+from populater import populate_from_files, dump_json
 import pandas as pd
 from datetime import datetime
 from validator import validate_balance_sheet, count_extracted_fields
 
-def test_single_pdf(pdf_path, template_path):
+def test_single_pdf(pdf_path, template_path, split_pages=True):
     """Test extraction accuracy for a single PDF"""
     print(f"\n=== Testing: {pdf_path.name} ===")
     
     try:
         # Step 1: Extract text from PDF
         print("  Step 1: Extracting text from PDF...")
-        process_pdf(pdf_path)
+        process_pdf(pdf_path, split_pages=split_pages)
         
         # Step 2: Find the generated text file
         base_name = pdf_path.stem
@@ -83,12 +83,7 @@ def run_accuracy_tests():
         return
     
     # Find all PDF files
-    pdf_files = []
-    for root, dirs, files in os.walk(downloads_folder):
-        for file in files:
-            file_path = Path(root) / file
-            if file_path.suffix.lower() == '.pdf':
-                pdf_files.append(file_path)
+    pdf_files = find_pdf_files(downloads_folder)
     
     if not pdf_files:
         print("ERROR: No PDF files found in downloads folder!")
@@ -96,20 +91,18 @@ def run_accuracy_tests():
     
     print(f"Found {len(pdf_files)} PDF files to test")
     
-    # Run tests
-    all_results = []
-    successful_tests = 0
+    # Run tests across worker processes; results are reported in input order.
+    # The pool already uses every worker, so PDFs are not split into page ranges.
+    unique, shared = partition_by_stem(pdf_files)
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = dict(zip(unique, executor.map(test_single_pdf, unique, repeat(template_path), repeat(False), chunksize=1)))
     
-    for i, pdf_path in enumerate(pdf_files, 1):
-        print(f"\n{'='*50}")
-        print(f"TEST {i}/{len(pdf_files)}")
-        print(f"{'='*50}")
-        
-        result = test_single_pdf(pdf_path, template_path)
-        all_results.append(result)
-        
-        if result.get("success", False):
-            successful_tests += 1
+    # PDFs sharing a file stem write to the same data/ files, so run them one at a time
+    for pdf_path in shared:
+        results[pdf_path] = test_single_pdf(pdf_path, template_path)
+    all_results = [results[pdf_path] for pdf_path in pdf_files]
+    
+    successful_tests = sum(1 for result in all_results if result.get("success", False))
     
     # Generate summary report
     generate_test_report(all_results, successful_tests, len(pdf_files))
@@ -174,8 +167,7 @@ def generate_test_report(results, successful_tests, total_tests):
         "detailed_results": results
     }
     
-    with open(report_file, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, indent=2)
+    dump_json(report_data, report_file)
     
     print(f"\nDetailed report saved to: {report_file}")
 
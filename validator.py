@@ -1,5 +1,6 @@
 import json
 import shutil
+import numpy as np
 from pathlib import Path
 
 def validate_balance_sheet(populated_data):
@@ -29,28 +30,37 @@ def validate_balance_sheet(populated_data):
     }
     return validation_results
 
+# Header fields that are text, not balance sheet amounts
+HEADER_FIELDS = {"company_name", "report_date", "report_title"}
+
+def flatten_numeric_fields(populated_data):
+    """Flatten the nested balance sheet into parallel lists of dotted field paths and numeric values."""
+    names = []
+    values = []
+    # Stack of (prefix, iterator over that dict's items) keeps the original depth-first order
+    stack = [("", iter(populated_data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if key in HEADER_FIELDS:
+                continue
+            field_path = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, (int, float)):
+                names.append(field_path)
+                values.append(value)
+            elif isinstance(value, dict):
+                stack.append((field_path, iter(value.items())))
+                break
+        else:
+            stack.pop()
+    return names, np.asarray(values, dtype=np.float64)
+
 def count_extracted_fields(populated_data):
     """Count how many fields were successfully extracted (non-zero) and collect missing fields."""
-    extracted_count = 0
-    total_count = 0
-    missing_fields = []
-
-    def count_fields(obj, prefix=""):
-        nonlocal extracted_count, total_count, missing_fields
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if key in ["company_name", "report_date", "report_title"]:
-                    continue
-                field_path = f"{prefix}.{key}" if prefix else key
-                if isinstance(value, (int, float)):
-                    total_count += 1
-                    if value != 0:
-                        extracted_count += 1
-                    else:
-                        missing_fields.append(field_path)
-                elif isinstance(value, dict):
-                    count_fields(value, field_path)
-    count_fields(populated_data)
+    names, values = flatten_numeric_fields(populated_data)
+    extracted_count = int(np.count_nonzero(values))
+    total_count = values.size
+    missing_fields = [names[i] for i in np.flatnonzero(values == 0)]
     extraction_rate = (extracted_count / total_count * 100) if total_count > 0 else 0
     return {
         "extracted_fields": extracted_count,